@@ -17,20 +17,27 @@ CAN commands use Linux can-utils:
 import os
 import re
 import json
+import io
+import mmap
 import shutil
 import asyncio
 import subprocess
 import signal
+import threading
 import time
+import zipfile
+from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List
 from uuid import uuid4
 from contextlib import asynccontextmanager
 
+import orjson
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Query, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 # =============================================================================
@@ -79,6 +86,42 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Max size of an imported log (import_log)
+IMPORT_LOG_MAX_SIZE = 100 * 1024 * 1024
+
+
+class ImportLogSizeLimitMiddleware:
+    """
+    Reject oversized log imports from Content-Length.
+    FastAPI reads the whole multipart body before import_log runs, so the
+    check has to happen here to spare the upload and its temp file.
+    Plain ASGI: every other request goes through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"].endswith("/import-log"):
+            content_length = 0
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    try:
+                        content_length = int(value)
+                    except ValueError:
+                        pass
+                    break
+            # Content-Length covers the whole multipart body: allow for its envelope
+            if content_length > IMPORT_LOG_MAX_SIZE + 64 * 1024:
+                response = JSONResponse(status_code=413, content={"detail": "Fichier trop volumineux (max 100 Mo)"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so that CORS stays outermost and wraps its 413
+app.add_middleware(ImportLogSizeLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -317,20 +360,36 @@ class CANInterfaceStatus(BaseModel):
 # Helper Functions - Filesystem
 # =============================================================================
 
+UNSAFE_ID_CHARS_RE = re.compile(r'[^a-zA-Z0-9_\-]')
+UNSAFE_NAME_CHARS_RE = re.compile(r'[^\w\-_]')
+
+
+@lru_cache(maxsize=1024)
 def sanitize_id(value: str) -> str:
     """Sanitize any ID to prevent path traversal"""
     # Remove any path separators or dangerous characters
-    safe = re.sub(r'[^a-zA-Z0-9_\-]', '', value)
+    safe = UNSAFE_ID_CHARS_RE.sub('', value)
     if not safe or safe.startswith('.'):
         raise HTTPException(status_code=400, detail=f"ID invalide: {value}")
     return safe
 
+@lru_cache(maxsize=1024)
 def get_mission_dir(mission_id: str) -> Path:
     """Get mission directory from filesystem"""
     safe_id = sanitize_id(mission_id)
     return MISSIONS_DIR / safe_id
 
 
+def require_mission_dir(mission_id: str) -> Path:
+    """Get mission directory, raising 404 if the mission does not exist"""
+    mission_dir = get_mission_dir(mission_id)
+    try:
+        os.stat(mission_dir)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Mission non trouvee")
+    return mission_dir
+
+
 def get_mission_file(mission_id: str) -> Path:
     """Get mission.json path"""
     return get_mission_dir(mission_id) / "mission.json"
@@ -346,10 +405,10 @@ def get_mission_logs_dir(mission_id: str) -> Path:
 def load_mission(mission_id: str) -> dict:
     """Load mission from filesystem"""
     file_path = get_mission_file(mission_id)
-    if not file_path.exists():
+    try:
+        return orjson.loads(file_path.read_bytes())
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Mission not found")
-    with open(file_path, "r") as f:
-        return json.load(f)
 
 
 def save_mission(mission_id: str, data: dict):
@@ -357,34 +416,75 @@ def save_mission(mission_id: str, data: dict):
     mission_dir = get_mission_dir(mission_id)
     mission_dir.mkdir(parents=True, exist_ok=True)
     file_path = get_mission_file(mission_id)
-    with open(file_path, "w") as f:
-        json.dump(data, f, indent=2, default=str)
+    # Like json.dump(indent=2, default=str), datetimes go through str(); unlike it,
+    # non-ASCII text is written as UTF-8 rather than \u escapes (load_mission reads both)
+    file_path.write_bytes(orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    ))
 
 
 def list_all_missions() -> list[dict]:
     """List all missions from filesystem"""
     missions = []
-    for mission_dir in MISSIONS_DIR.iterdir():
-        if mission_dir.is_dir():
-            mission_file = mission_dir / "mission.json"
-            if mission_file.exists():
+    with os.scandir(MISSIONS_DIR) as it:
+        for entry in it:
+            if entry.is_dir():
                 try:
-                    with open(mission_file, "r") as f:
-                        missions.append(json.load(f))
+                    with open(os.path.join(entry.path, "mission.json"), "rb") as f:
+                        missions.append(orjson.loads(f.read()))
                 except Exception:
                     continue
     return sorted(missions, key=lambda x: x.get("updatedAt", ""), reverse=True)
 
 
-def count_log_frames(log_file: Path) -> int:
-    """Count frames in a candump log file"""
+# Newline followed by a complete blank or comment line (not a frame).
+# Starts with a literal, so the engine skips straight from one newline to the next.
+NON_FRAME_LINE_RE = re.compile(rb"\n(?=#|[^\S\n]*\n)")
+
+
+@lru_cache(maxsize=1024)
+def _count_log_frames_cached(path: str, mtime_ns: int, size: int) -> int:
+    """Frame count of a log, memoized on its (path, mtime, size)"""
     try:
-        with open(log_file, "r") as f:
-            return sum(1 for line in f if line.strip() and not line.startswith("#"))
+        count = 0
+        # Carry the newline ending the previous line, so every line start is
+        # preceded by one (including the first line of the file)
+        tail = b"\n"
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                data = tail + chunk
+                # Count whole lines only, carry the partial last one over
+                cut = data.rfind(b"\n") + 1
+                tail = data[cut - 1:]
+                count += data.count(b"\n", 1, cut) - len(NON_FRAME_LINE_RE.findall(data, 0, cut))
+        last_line = tail[1:]
+        if last_line.strip() and not last_line.startswith(b"#"):
+            count += 1
+        return count
     except Exception:
         return 0
 
 
+def count_log_frames(path: str, st: os.stat_result) -> int:
+    """Count frames in a candump log file, given its stat (a DirEntry's is free)"""
+    return _count_log_frames_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def iter_log_entries(root: Path, recursive: bool = False):
+    """Yield the DirEntry of each .log file under root, in a single scandir pass"""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".log") and entry.is_file():
+                    yield entry
+
+
 def update_mission_stats(mission_id: str, new_capture: bool = False):
     """Update mission log/frame counts and optionally lastCaptureDate"""
     mission = load_mission(mission_id)
@@ -394,11 +494,12 @@ def update_mission_stats(mission_id: str, new_capture: bool = False):
     frames_count = 0
     latest_log_time = None
     
-    for log_file in logs_dir.glob("*.log"):
+    for entry in iter_log_entries(logs_dir):
+        st = entry.stat()
         logs_count += 1
-        frames_count += count_log_frames(log_file)
+        frames_count += count_log_frames(entry.path, st)
         # Track latest log modification time
-        log_mtime = log_file.stat().st_mtime
+        log_mtime = st.st_mtime
         if latest_log_time is None or log_mtime > latest_log_time:
             latest_log_time = log_mtime
     
@@ -461,6 +562,10 @@ def get_can_interface_status(interface: str) -> CANInterfaceStatus:
     Note: For vcan interfaces, operstate is "UNKNOWN" (no physical link),
     so we also check the flags for "UP".
     """
+    # Absent interface (e.g. no second CAN channel): sysfs says so without forking ip
+    if not os.path.exists(f"/sys/class/net/{interface}"):
+        return CANInterfaceStatus(interface=interface, up=False)
+    
     try:
         result = run_command(["ip", "-details", "-json", "link", "show", interface], check=False)
         if result.returncode != 0:
@@ -632,12 +737,12 @@ async def broadcast_to_websockets(message: str):
                         can_id, data = frame_parts
                         data_formatted = " ".join(data[i:i+2] for i in range(0, len(data), 2))
 
-                        payload = json.dumps({
+                        payload = orjson.dumps({
                             "timestamp": timestamp,
                             "interface": iface,
                             "canId": can_id,
                             "data": data_formatted,
-                        })
+                        }).decode()
 
                         await self.broadcast(payload)
 
@@ -677,12 +782,11 @@ candump_mgr = CandumpManager()
 # System Status
 # =============================================================================
 
-@app.get("/status", response_model=SystemStatus)
-@app.get("/api/status", response_model=SystemStatus)  # alias
-async def get_system_status():
+def read_system_status() -> SystemStatus:
     """
     Get complete Raspberry Pi system status.
     Reads from /proc and /sys filesystems and uses ip commands.
+    Blocking: run it in a thread.
     """
     # Hostname
     try:
@@ -741,6 +845,16 @@ async def get_system_status():
         storage_total = 64.0
         storage_used = 32.0
     
+    # Addresses of every interface in one call, picked per interface below
+    addr_infos = {}
+    try:
+        result = run_command(["ip", "-json", "addr", "show"], check=False)
+        if result.returncode == 0:
+            for iface_data in json.loads(result.stdout):
+                addr_infos[iface_data.get("ifname")] = iface_data.get("addr_info", [])
+    except Exception:
+        pass
+    
     # Network - WiFi
     wifi_connected = False
     wifi_ip = None
@@ -751,18 +865,14 @@ async def get_system_status():
     wifi_is_hotspot = False
     wifi_hotspot_ssid = None
     try:
-        result = run_command(["ip", "-json", "addr", "show", "wlan0"], check=False)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            if data:
-                for addr_info in data[0].get("addr_info", []):
-                    if addr_info.get("family") == "inet":
-                        wifi_ip = addr_info.get("local")
-                        wifi_connected = True
-                        # Check if it's a hotspot IP (10.42.0.x)
-                        if wifi_ip and wifi_ip.startswith("10.42.0."):
-                            wifi_is_hotspot = True
-                        break
+        for addr_info in addr_infos.get("wlan0", []):
+            if addr_info.get("family") == "inet":
+                wifi_ip = addr_info.get("local")
+                wifi_connected = True
+                # Check if it's a hotspot IP (10.42.0.x)
+                if wifi_ip and wifi_ip.startswith("10.42.0."):
+                    wifi_is_hotspot = True
+                break
         
         if wifi_connected:
             # Check nmcli for connection info and mode
@@ -840,18 +950,11 @@ async def get_system_status():
     # Network - Ethernet
     ethernet_connected = False
     ethernet_ip = None
-    try:
-        result = run_command(["ip", "-json", "addr", "show", "eth0"], check=False)
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            if data:
-                for addr_info in data[0].get("addr_info", []):
-                    if addr_info.get("family") == "inet":
-                        ethernet_ip = addr_info.get("local")
-                        ethernet_connected = True
-                        break
-    except Exception:
-        pass
+    for addr_info in addr_infos.get("eth0", []):
+        if addr_info.get("family") == "inet":
+            ethernet_ip = addr_info.get("local")
+            ethernet_connected = True
+            break
     
     # CAN interfaces
     can0_status = get_can_interface_status("can0")
@@ -897,12 +1000,20 @@ async def get_system_status():
     )
 
 
+@app.get("/status", response_model=SystemStatus)
+@app.get("/api/status", response_model=SystemStatus)  # alias
+async def get_system_status():
+    """Get complete Raspberry Pi system status"""
+    # /proc reads and a dozen subprocesses: keep them off the event loop
+    return await asyncio.to_thread(read_system_status)
+
+
 @app.get("/api/can/{interface}/status", response_model=CANInterfaceStatus)
 async def get_can_status(interface: str):
     """Get status of a specific CAN interface"""
     if interface not in ["can0", "can1", "vcan0"]:
         raise HTTPException(status_code=400, detail="Invalid interface. Use can0, can1, or vcan0.")
-    return get_can_interface_status(interface)
+    return await asyncio.to_thread(get_can_interface_status, interface)
 
 
 # =============================================================================
@@ -1584,27 +1695,24 @@ async def list_mission_logs(mission_id: str):
     
     logs_dir = get_mission_logs_dir(mission_id)
     logs = []
-    log_names = set()
     
-    # First pass: collect all log names
-    for log_file in logs_dir.glob("*.log"):
-        log_names.add(log_file.stem)
+    # Single directory scan; first collect all log names
+    log_entries = list(iter_log_entries(logs_dir))
+    log_names = {entry.name[:-4] for entry in log_entries}
     
-    for log_file in logs_dir.glob("*.log"):
-        stat = log_file.stat()
-        frames_count = count_log_frames(log_file)
+    for entry in log_entries:
+        stat = entry.stat()
+        frames_count = count_log_frames(entry.path, stat)
+        log_stem = entry.name[:-4]
         
         # Load metadata if exists
         meta = {}
-        meta_file = log_file.with_suffix(".meta.json")
-        if meta_file.exists():
-            try:
-                with open(meta_file, "r") as f:
-                    meta = json.load(f)
-            except Exception:
-                pass
+        try:
+            with open(os.path.join(logs_dir, f"{log_stem}.meta.json"), "rb") as f:
+                meta = orjson.loads(f.read())
+        except Exception:
+            pass
         
-        log_stem = log_file.stem
         parent_id = None
         is_origin = False
         
@@ -1627,7 +1735,7 @@ async def list_mission_logs(mission_id: str):
         
         logs.append(LogEntry(
             id=log_stem,
-            filename=log_file.name,
+            filename=entry.name,
             size=stat.st_size,
             framesCount=frames_count,
             createdAt=datetime.fromtimestamp(stat.st_ctime),
@@ -1661,7 +1769,6 @@ async def download_log(mission_id: str, log_id: str):
 @app.get("/api/missions/{mission_id}/logs/{log_id}/download-family")
 async def download_log_family(mission_id: str, log_id: str):
     """Download a log and all its children (splits) as a ZIP file"""
-    import zipfile
     import tempfile
     
     load_mission(mission_id)
@@ -2161,12 +2268,12 @@ async def websocket_candump(websocket: WebSocket, interface: str = Query(default
                                     data[i:i+2] for i in range(0, len(data), 2)
                                 )
                                 
-                                message = json.dumps({
+                                message = orjson.dumps({
                                     "timestamp": timestamp,
                                     "interface": iface,
                                     "canId": can_id,
                                     "data": data_formatted,
-                                })
+                                }).decode()
                                 await broadcast_to_websockets(message)
                 except Exception:
                     pass
@@ -2654,12 +2761,12 @@ async def websocket_cansniffer(websocket: WebSocket, interface: str = Query(defa
                                 dlc = 8
                                 data_part = "".join(parts[4:]) if len(parts) > 4 else ""
                             
-                            msg = json.dumps({
+                            msg = orjson.dumps({
                                 "timestamp": float(timestamp) if timestamp else time.time(),
                                 "canId": can_id,
                                 "data": data_part.upper(),
                                 "dlc": dlc,
-                            })
+                            }).decode()
                             await websocket.send_text(msg)
                 except Exception as e:
                     # Skip malformed lines
@@ -2671,7 +2778,7 @@ async def websocket_cansniffer(websocket: WebSocket, interface: str = Query(defa
         pass
     except Exception as e:
         try:
-            await websocket.send_text(json.dumps({"error": str(e)}))
+            await websocket.send_text(orjson.dumps({"error": str(e)}).decode())
         except:
             pass
     finally:
@@ -3818,7 +3925,9 @@ async def restart_services():
     try:
         results = []
         for service in ["aurige-api", "aurige-web"]:
-            result = run_command(["sudo", "systemctl", "restart", service], check=False)
+            result = await asyncio.to_thread(
+                run_command, ["sudo", "systemctl", "restart", service], check=False
+            )
             if result.returncode == 0:
                 results.append(f"{service}: OK")
             else:
@@ -4313,96 +4422,150 @@ class CompareLogsResponse(BaseModel):
     identical_count: int     # IDs with same payload in both
     frames: list[CompareFrameDiff]
 
-@app.post("/api/missions/{mission_id}/compare-logs", response_model=CompareLogsResponse)
-async def compare_logs(mission_id: str, request: CompareLogsRequest):
-    """Compare two logs to identify differential frames between states (e.g., open vs closed)"""
-    from collections import Counter, defaultdict
-    
-    mission_dir = Path(MISSIONS_DIR) / sanitize_id(mission_id)
-    if not mission_dir.exists():
-        raise HTTPException(status_code=404, detail="Mission non trouvee")
-    
-    log_a_file = mission_dir / "logs" / f"{sanitize_id(request.log_a_id)}.log"
-    log_b_file = mission_dir / "logs" / f"{sanitize_id(request.log_b_id)}.log"
-    
-    if not log_a_file.exists():
-        raise HTTPException(status_code=404, detail=f"Log A non trouve: {request.log_a_id}")
-    if not log_b_file.exists():
-        raise HTTPException(status_code=404, detail=f"Log B non trouve: {request.log_b_id}")
-    
-    def parse_log(log_file: Path) -> dict[str, list[str]]:
-        """Parse log and return dict of can_id -> list of payloads"""
-        frames = defaultdict(list)
-        with open(log_file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                match = re.match(r"\((\d+\.\d+)\)\s+\w+\s+([0-9A-Fa-f]+)#([0-9A-Fa-f]*)", line)
-                if match:
-                    can_id = match.group(2).upper()
-                    data = match.group(3).upper()
-                    frames[can_id].append(data)
-        return dict(frames)
-    
-    def get_most_common(data_list: list[str]) -> str:
-        if not data_list:
-            return ""
-        return Counter(data_list).most_common(1)[0][0]
-    
-    # Parse both logs
-    frames_a = parse_log(log_a_file)
-    frames_b = parse_log(log_b_file)
-    
-    # Get all unique CAN IDs
-    all_ids = set(frames_a.keys()) | set(frames_b.keys())
-    
-    # Compare each ID
+# Byte value -> hex string, and the reverse lookup (payloads are upper-cased; odd-length tails are 1 char)
+HEX_BYTE_STRINGS = [f"{v:02X}" for v in range(256)]
+HEX_BYTE_VALUES = {h: v for v, h in enumerate(HEX_BYTE_STRINGS)}
+HEX_BYTE_VALUES.update({f"{v:X}": v for v in range(16)})
+
+# candump line "(timestamp) iface CANID#DATA", matched over a whole bytes buffer
+CANDUMP_PAYLOAD_RE = re.compile(
+    rb"^[^\S\n]*\((\d+\.\d+)\)[^\S\n]+\w+[^\S\n]+([0-9A-Fa-f]+)#([0-9A-Fa-f]*)",
+    re.MULTILINE,
+)
+
+# Parsed payloads take ~1.5x the log size in memory: keep just the last couple
+# of compared pairs, stale (rewritten) entries are pushed out quickly
+@lru_cache(maxsize=4)
+def _parse_log_payloads_cached(path: str, mtime_ns: int, size: int) -> dict[str, list[str]]:
+    """Parse log and return dict of can_id -> list of payloads (cached, treat as read-only)"""
+    frames = defaultdict(list)
+    if size == 0:
+        return {}
+    # Scan the mapped file as bytes: no per-line decode/strip, pages are read lazily
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in CANDUMP_PAYLOAD_RE.finditer(mm):
+            can_id = match.group(2).decode("ascii").upper()
+            data = match.group(3).decode("ascii").upper()
+            frames[can_id].append(data)
+    return dict(frames)
+
+def parse_log_payloads(log_file: Path) -> dict[str, list[str]]:
+    """Parse a log, reusing the previous result while the file is unchanged"""
+    st = log_file.stat()
+    return _parse_log_payloads_cached(str(log_file), st.st_mtime_ns, st.st_size)
+
+def get_most_common(payload_counts: Counter) -> str:
+    if not payload_counts:
+        return ""
+    # Plain max() avoids most_common()'s list building; ties resolve the same way
+    return max(payload_counts, key=payload_counts.__getitem__)
+
+def compare_can_ids(
+    can_ids: list[str],
+    frames_a: dict[str, list[str]],
+    frames_b: dict[str, list[str]],
+    include_identical: bool,
+) -> tuple[list[CompareFrameDiff], Counter]:
+    """
+    Compare the payloads of each CAN ID between two parsed logs.
+    Returns the frames in can_ids order and the count per classification.
+    Frames are built with model_construct: every field is computed here, so
+    validating thousands of them per response would be wasted work.
+    """
     results = []
-    differential_count = 0
-    only_a_count = 0
-    only_b_count = 0
-    identical_count = 0
+    counts = Counter()
     
-    for can_id in sorted(all_ids):
+    for can_id in can_ids:
         payloads_a = frames_a.get(can_id, [])
         payloads_b = frames_b.get(can_id, [])
         
-        payload_a = get_most_common(payloads_a)
-        payload_b = get_most_common(payloads_b)
+        # Identical frames that will not be emitted: count them and skip all analysis
+        if not include_identical and payloads_a and payloads_a == payloads_b:
+            counts["identical"] += 1
+            continue
+        
+        # Count each distinct payload once, reused for every metric below
+        payload_counts_a = Counter(payloads_a)
+        payload_counts_b = Counter(payloads_b)
+        
+        payload_a = get_most_common(payload_counts_a)
+        payload_b = get_most_common(payload_counts_b)
         
         # Count unique payloads in each log
-        unique_a = len(set(payloads_a)) if payloads_a else 0
-        unique_b = len(set(payloads_b)) if payloads_b else 0
+        unique_a = len(payload_counts_a)
+        unique_b = len(payload_counts_b)
         
         # Dominant ratio: how much the most common payload dominates
         dominant_a = 0.0
         dominant_b = 0.0
         if payloads_a:
-            counter_a = Counter(payloads_a)
-            dominant_a = round(counter_a.most_common(1)[0][1] / len(payloads_a) * 100, 1)
+            dominant_a = round(payload_counts_a[payload_a] / len(payloads_a) * 100, 1)
         if payloads_b:
-            counter_b = Counter(payloads_b)
-            dominant_b = round(counter_b.most_common(1)[0][1] / len(payloads_b) * 100, 1)
-        
-        # Determine classification
-        if not payloads_a:
-            classification = "only_b"
-            only_b_count += 1
-            confidence = 80.0
-        elif not payloads_b:
-            classification = "only_a"
-            only_a_count += 1
-            confidence = 80.0
-        elif payload_a == payload_b:
-            classification = "identical"
-            identical_count += 1
-            confidence = 95.0
-        else:
-            classification = "differential"
-            differential_count += 1
-            # Higher confidence if more samples
-            confidence = min(95.0, 60.0 + min(len(payloads_a), len(payloads_b)) * 2)
+            dominant_b = round(payload_counts_b[payload_b] / len(payloads_b) * 100, 1)
+        
+        # Frames only in one log: no byte analysis possible, take the fast path
+        if not payloads_a or not payloads_b:
+            if not payloads_a:
+                classification = "only_b"
+                counts["only_b"] += 1
+                dominant, unique = dominant_b, unique_b
+            else:
+                classification = "only_a"
+                counts["only_a"] += 1
+                dominant, unique = dominant_a, unique_a
+            
+            # Could be interesting if very stable
+            if unique <= 1:
+                stability = 70.0
+            elif unique <= 3:
+                stability = 50.0
+            else:
+                stability = max(10.0, dominant * 0.3)
+            
+            results.append(CompareFrameDiff.model_construct(
+                can_id=can_id,
+                payload_a=payload_a,
+                payload_b=payload_b,
+                count_a=len(payloads_a),
+                count_b=len(payloads_b),
+                bytes_changed=[],
+                classification=classification,
+                confidence=80.0,
+                unique_payloads_a=unique_a,
+                unique_payloads_b=unique_b,
+                stability_score=round(stability, 1),
+                dominant_ratio_a=dominant_a,
+                dominant_ratio_b=dominant_b,
+                byte_change_detail=[],
+            ))
+            continue
+        
+        # Same dominant payload on both sides: identical, nothing to diff
+        if payload_a == payload_b:
+            counts["identical"] += 1
+            # Only include identical frames when there are few IDs
+            if include_identical:
+                results.append(CompareFrameDiff.model_construct(
+                    can_id=can_id,
+                    payload_a=payload_a,
+                    payload_b=payload_b,
+                    count_a=len(payloads_a),
+                    count_b=len(payloads_b),
+                    bytes_changed=[],
+                    classification="identical",
+                    confidence=95.0,
+                    unique_payloads_a=unique_a,
+                    unique_payloads_b=unique_b,
+                    stability_score=0.0,
+                    dominant_ratio_a=dominant_a,
+                    dominant_ratio_b=dominant_b,
+                    byte_change_detail=[],
+                ))
+            continue
+        
+        counts["differential"] += 1
+        # Higher confidence if more samples
+        confidence = min(95.0, 60.0 + min(len(payloads_a), len(payloads_b)) * 2)
         
         # Find changed bytes with detail
         bytes_changed = []
@@ -4417,17 +4580,18 @@ async def compare_logs(mission_id: str, request: CompareLogsRequest):
                 if byte_a != byte_b:
                     byte_idx = i // 2
                     bytes_changed.append(byte_idx)
-                    try:
-                        val_a = int(byte_a, 16)
-                        val_b = int(byte_b, 16)
+                    val_a = HEX_BYTE_VALUES.get(byte_a)
+                    val_b = HEX_BYTE_VALUES.get(byte_b)
+                    if val_a is not None and val_b is not None:
+                        decimal_diff = abs(val_a - val_b)
                         byte_change_detail.append({
                             "index": byte_idx,
                             "val_a": byte_a,
                             "val_b": byte_b,
-                            "hex_diff": f"{abs(val_a - val_b):02X}",
-                            "decimal_diff": abs(val_a - val_b),
+                            "hex_diff": HEX_BYTE_STRINGS[decimal_diff],
+                            "decimal_diff": decimal_diff,
                         })
-                    except ValueError:
+                    else:
                         byte_change_detail.append({
                             "index": byte_idx,
                             "val_a": byte_a,
@@ -4448,100 +4612,119 @@ async def compare_logs(mission_id: str, request: CompareLogsRequest):
         # ============================================================
         stability = 0.0
         
-        if classification == "differential":
-            # 1. Payload consistency (40 pts max)
-            #    Higher dominant ratio = more stable signal
-            avg_dominant = (dominant_a + dominant_b) / 2
-            stability += min(40.0, avg_dominant * 0.4)
-            
-            # 2. Low variation (30 pts max)
-            #    Fewer unique payloads = cleaner signal
-            avg_unique = (unique_a + unique_b) / 2
-            if avg_unique <= 1:
-                stability += 30.0  # Perfect: one payload per log
-            elif avg_unique <= 2:
-                stability += 25.0
-            elif avg_unique <= 5:
-                stability += 15.0
-            elif avg_unique <= 10:
-                stability += 5.0
-            
-            # 3. Targeted change (20 pts max)
-            #    Fewer bytes changed = more precise signal
-            n_bytes_changed = len(bytes_changed)
-            if n_bytes_changed == 1:
-                stability += 20.0  # Perfect: single byte toggle
-            elif n_bytes_changed == 2:
-                stability += 15.0
-            elif n_bytes_changed <= 4:
-                stability += 8.0
-            
-            # 4. Sample count (10 pts max)
-            #    More frames = more reliable
-            min_count = min(len(payloads_a), len(payloads_b))
-            if min_count >= 50:
-                stability += 10.0
-            elif min_count >= 20:
-                stability += 7.0
-            elif min_count >= 5:
-                stability += 4.0
-            
-            stability = min(100.0, round(stability, 1))
-        
-        elif classification in ("only_a", "only_b"):
-            # Frames only in one log: could be interesting if very stable
-            payloads = payloads_a if classification == "only_a" else payloads_b
-            dominant = dominant_a if classification == "only_a" else dominant_b
-            unique = unique_a if classification == "only_a" else unique_b
-            
-            if unique <= 1:
-                stability = 70.0
-            elif unique <= 3:
-                stability = 50.0
-            else:
-                stability = max(10.0, dominant * 0.3)
-            stability = round(stability, 1)
-        
-        # Only include interesting frames (not identical unless few)
-        if classification != "identical" or len(all_ids) < 50:
-            results.append(CompareFrameDiff(
-                can_id=can_id,
-                payload_a=payload_a,
-                payload_b=payload_b,
-                count_a=len(payloads_a),
-                count_b=len(payloads_b),
-                bytes_changed=bytes_changed,
-                classification=classification,
-                confidence=confidence,
-                unique_payloads_a=unique_a,
-                unique_payloads_b=unique_b,
-                stability_score=stability,
-                dominant_ratio_a=dominant_a,
-                dominant_ratio_b=dominant_b,
-                byte_change_detail=byte_change_detail,
-            ))
+        # 1. Payload consistency (40 pts max)
+        #    Higher dominant ratio = more stable signal
+        avg_dominant = (dominant_a + dominant_b) / 2
+        stability += min(40.0, avg_dominant * 0.4)
+        
+        # 2. Low variation (30 pts max)
+        #    Fewer unique payloads = cleaner signal
+        avg_unique = (unique_a + unique_b) / 2
+        if avg_unique <= 1:
+            stability += 30.0  # Perfect: one payload per log
+        elif avg_unique <= 2:
+            stability += 25.0
+        elif avg_unique <= 5:
+            stability += 15.0
+        elif avg_unique <= 10:
+            stability += 5.0
+        
+        # 3. Targeted change (20 pts max)
+        #    Fewer bytes changed = more precise signal
+        n_bytes_changed = len(bytes_changed)
+        if n_bytes_changed == 1:
+            stability += 20.0  # Perfect: single byte toggle
+        elif n_bytes_changed == 2:
+            stability += 15.0
+        elif n_bytes_changed <= 4:
+            stability += 8.0
+        
+        # 4. Sample count (10 pts max)
+        #    More frames = more reliable
+        min_count = min(len(payloads_a), len(payloads_b))
+        if min_count >= 50:
+            stability += 10.0
+        elif min_count >= 20:
+            stability += 7.0
+        elif min_count >= 5:
+            stability += 4.0
+        
+        stability = min(100.0, round(stability, 1))
+        
+        results.append(CompareFrameDiff.model_construct(
+            can_id=can_id,
+            payload_a=payload_a,
+            payload_b=payload_b,
+            count_a=len(payloads_a),
+            count_b=len(payloads_b),
+            bytes_changed=bytes_changed,
+            classification="differential",
+            confidence=confidence,
+            unique_payloads_a=unique_a,
+            unique_payloads_b=unique_b,
+            stability_score=stability,
+            dominant_ratio_a=dominant_a,
+            dominant_ratio_b=dominant_b,
+            byte_change_detail=byte_change_detail,
+        ))
     
-    # Sort: differential first, then by stability_score DESC (most stable = best for reverse)
-    priority = {"differential": 0, "only_a": 1, "only_b": 2, "identical": 3}
-    results.sort(key=lambda x: (priority.get(x.classification, 4), -x.stability_score, -x.confidence))
-    
-    return CompareLogsResponse(
-        log_a_name=request.log_a_id,
-        log_b_name=request.log_b_id,
-        total_ids_a=len(frames_a),
-        total_ids_b=len(frames_b),
-        differential_count=differential_count,
-        only_a_count=only_a_count,
-        only_b_count=only_b_count,
-        identical_count=identical_count,
-        frames=results
-    )
+    return results, counts
+
+@app.post("/api/missions/{mission_id}/compare-logs", response_model=CompareLogsResponse)
+async def compare_logs(mission_id: str, request: CompareLogsRequest):
+    """Compare two logs to identify differential frames between states (e.g., open vs closed)"""
+    mission_dir = require_mission_dir(mission_id)
+    
+    log_a_file = mission_dir / "logs" / f"{sanitize_id(request.log_a_id)}.log"
+    log_b_file = mission_dir / "logs" / f"{sanitize_id(request.log_b_id)}.log"
+    
+    if not log_a_file.exists():
+        raise HTTPException(status_code=404, detail=f"Log A non trouve: {request.log_a_id}")
+    if not log_b_file.exists():
+        raise HTTPException(status_code=404, detail=f"Log B non trouve: {request.log_b_id}")
+    
+    def compare() -> CompareLogsResponse:
+        # Parse both logs
+        frames_a = parse_log_payloads(log_a_file)
+        frames_b = parse_log_payloads(log_b_file)
+        
+        # Get all unique CAN IDs, in numeric order (hex strings kept for output)
+        all_ids = sorted(frames_a.keys() | frames_b.keys(), key=lambda cid: int(cid, 16))
+        # Only include identical frames when there are few IDs
+        include_identical = len(all_ids) < 50
+        
+        results, counts = compare_can_ids(all_ids, frames_a, frames_b, include_identical)
+        
+        # Sort: differential first, then by stability_score DESC (most stable = best for reverse)
+        priority = {"differential": 0, "only_a": 1, "only_b": 2, "identical": 3}
+        results.sort(key=lambda x: (priority.get(x.classification, 4), -x.stability_score, -x.confidence))
+        
+        return CompareLogsResponse(
+            log_a_name=request.log_a_id,
+            log_b_name=request.log_b_id,
+            total_ids_a=len(frames_a),
+            total_ids_b=len(frames_b),
+            differential_count=counts["differential"],
+            only_a_count=counts["only_a"],
+            only_b_count=counts["only_b"],
+            identical_count=counts["identical"],
+            frames=results
+        )
+    
+    # Parsing and comparing are CPU-bound: keep them off the event loop
+    return await asyncio.to_thread(compare)
 
 
 # =============================================================================
 # LOG IMPORT - Upload external log files
 # =============================================================================
 
+# Valid CAN log line: (timestamp) interface CANID#DATA, captured without surrounding blanks
+CAN_FRAME_RE = re.compile(
+    rb"^[^\S\n]*(\(\d+\.?\d*\)[^\S\n]+\w+[^\S\n]+[0-9A-Fa-f]+#[0-9A-Fa-f]*(?:[^\n]*\S)?)",
+    re.MULTILINE,
+)
+
 class ImportLogResponse(BaseModel):
     id: str
     filename: str
@@ -4551,9 +4734,7 @@ class ImportLogResponse(BaseModel):
 @app.post("/api/missions/{mission_id}/import-log", response_model=ImportLogResponse)
 async def import_log(mission_id: str, file: UploadFile = File(...)):
     """Import an external log file into a mission"""
-    mission_dir = Path(MISSIONS_DIR) / sanitize_id(mission_id)
-    if not mission_dir.exists():
-        raise HTTPException(status_code=404, detail="Mission non trouvee")
+    mission_dir = require_mission_dir(mission_id)
     
     logs_dir = mission_dir / "logs"
     logs_dir.mkdir(parents=True, exist_ok=True)
@@ -4567,40 +4748,58 @@ async def import_log(mission_id: str, file: UploadFile = File(...)):
     
     # Generate unique filename to avoid conflicts
     base_name = file.filename.replace(".log", "")
-    safe_name = re.sub(r'[^a-zA-Z0-9_-]', '_', base_name)
+    safe_name = UNSAFE_ID_CHARS_RE.sub('_', base_name)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     log_id = f"imported_{safe_name}_{timestamp}"
     log_filename = f"{log_id}.log"
     log_path = logs_dir / log_filename
     
-    # Read and validate content (max 100MB)
-    content = await file.read()
-    if len(content) > 100 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="Fichier trop volumineux (max 100 Mo)")
-    try:
-        text_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="Le fichier doit etre en UTF-8")
-    
-    # Count valid CAN frames
+    # Stream the upload in 1 MiB chunks (max 100MB): validate and write
+    # valid frames as they arrive instead of buffering the whole file
+    size_seen = 0
     frames_count = 0
-    valid_lines = []
-    for line in text_content.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-        # Validate CAN log format: (timestamp) interface CANID#DATA
-        match = re.match(r"\((\d+\.?\d*)\)\s+\w+\s+([0-9A-Fa-f]+)#([0-9A-Fa-f]*)", line)
-        if match:
-            frames_count += 1
-            valid_lines.append(line)
-    
-    if frames_count == 0:
-        raise HTTPException(status_code=400, detail="Aucune trame CAN valide trouvee dans le fichier")
+    # Pieces of the incomplete last line, joined once its newline arrives
+    pending: list[bytes] = []
+    
+    def write_valid_lines(out, data: bytes):
+        nonlocal frames_count
+        # data ends on a line boundary, so a UTF-8 check never splits a character;
+        # pure ASCII (the usual candump log) needs no decoding at all
+        if not data.isascii():
+            try:
+                data.decode("utf-8")
+            except UnicodeDecodeError:
+                raise HTTPException(status_code=400, detail="Le fichier doit etre en UTF-8")
+        # Single capture group: findall returns the stripped lines straight from C
+        valid_lines = CAN_FRAME_RE.findall(data)
+        if valid_lines:
+            # Lines are newline-separated, without a trailing newline
+            out.write((b"\n" if frames_count else b"") + b"\n".join(valid_lines))
+            frames_count += len(valid_lines)
     
-    # Save the file
-    with open(log_path, "w") as f:
-        f.write("\n".join(valid_lines))
+    try:
+        with open(log_path, "wb") as out:
+            while chunk := await file.read(1 << 20):
+                size_seen += len(chunk)
+                if size_seen > IMPORT_LOG_MAX_SIZE:
+                    raise HTTPException(status_code=413, detail="Fichier trop volumineux (max 100 Mo)")
+                # Only search the new chunk: the carried line has no newline
+                cut = chunk.rfind(b"\n") + 1
+                if not cut:
+                    pending.append(chunk)
+                    continue
+                pending.append(chunk[:cut])
+                data = b"".join(pending)
+                # Keep the incomplete last line for the next chunk
+                pending = [chunk[cut:]]
+                await asyncio.to_thread(write_valid_lines, out, data)
+            await asyncio.to_thread(write_valid_lines, out, b"".join(pending))
+        
+        if frames_count == 0:
+            raise HTTPException(status_code=400, detail="Aucune trame CAN valide trouvee dans le fichier")
+    except HTTPException:
+        log_path.unlink(missing_ok=True)
+        raise
     
     return ImportLogResponse(
         id=log_id,
@@ -4633,26 +4832,140 @@ class SavedComparison(BaseModel):
     result: dict
 
 def get_comparisons_file(mission_id: str) -> Path:
-    return Path(MISSIONS_DIR) / sanitize_id(mission_id) / "comparisons.json"
+    return get_mission_dir(mission_id) / "comparisons.jsonl"
+
+# comparisons.jsonl is append-only: one comparison or {"id", "_deleted": true}
+# tombstone per line. It is rewritten once dead lines exceed this ratio.
+COMPARISONS_COMPACT_RATIO = 0.25
+
+# Summary counts copied from "result" to the top level of each comparison,
+# so the list view never has to open the full result
+COMPARISON_SUMMARY_KEYS = ("differential_count", "only_a_count", "only_b_count", "identical_count")
+
+def _add_comparison_summary(comparison: dict) -> dict:
+    if "differential_count" not in comparison:
+        result = comparison.get("result") or {}
+        for key in COMPARISON_SUMMARY_KEYS:
+            comparison[key] = result.get(key, 0)
+    return comparison
+
+# comparisons.jsonl path -> ((mtime_ns, size), live comparisons, tombstone count)
+_comparisons_cache: dict[str, tuple[tuple[int, int], list[dict], int]] = {}
+# Writers run in worker threads: serializes reads and read-modify-writes of log and cache
+_comparisons_lock = threading.RLock()
+
+def _cache_comparisons(f: Path, comparisons: list[dict], tombstones: int):
+    st = f.stat()
+    _comparisons_cache[str(f)] = ((st.st_mtime_ns, st.st_size), comparisons, tombstones)
+
+def _replay_comparisons(f: Path) -> tuple[list[dict], int]:
+    """Replay the comparisons log into the list of live comparisons (under _comparisons_lock)"""
+    data = f.read_bytes()
+    end = data.rfind(b"\n") + 1
+    lines = data[:end].splitlines()
+    if data[end:].strip():
+        # Unterminated last line: an append cut short by a crash or a full disk.
+        # Repair the tail so that the next append starts on a line of its own.
+        try:
+            orjson.loads(data[end:])
+        except orjson.JSONDecodeError:
+            print(f"[WARNING] Dropping incomplete last line of {f}")
+            os.truncate(f, end)
+        else:
+            lines.append(data[end:])
+            with open(f, "ab") as fh:
+                fh.write(b"\n")
+    comparisons = []
+    tombstones = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        row = orjson.loads(line)
+        if row.get("_deleted"):
+            comparisons = [c for c in comparisons if c["id"] != row["id"]]
+            tombstones += 1
+        else:
+            # Rows saved before the summary existed are upgraded in memory
+            comparisons.append(_add_comparison_summary(row))
+    return comparisons, tombstones
 
 def load_comparisons(mission_id: str) -> list[dict]:
     f = get_comparisons_file(mission_id)
-    if f.exists():
-        with open(f, "r") as fh:
-            return json.load(fh)
-    return []
+    # Held by readers too: an append from a worker thread may be half-written
+    with _comparisons_lock:
+        try:
+            st = f.stat()
+        except FileNotFoundError:
+            # One-time migration from the former single-document comparisons.json
+            legacy = f.with_suffix(".json")
+            try:
+                legacy_comparisons = orjson.loads(legacy.read_bytes())
+            except FileNotFoundError:
+                return []
+            save_comparisons(mission_id, [_add_comparison_summary(c) for c in legacy_comparisons])
+            legacy.unlink(missing_ok=True)
+            st = f.stat()
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _comparisons_cache.get(str(f))
+        if cached is None or cached[0] != key:
+            comparisons, tombstones = _replay_comparisons(f)
+            # Stat again: the replay may have repaired the tail
+            _cache_comparisons(f, comparisons, tombstones)
+            return list(comparisons)
+        # Shallow copy: callers filter the list
+        return list(cached[1])
 
 def save_comparisons(mission_id: str, comparisons: list[dict]):
+    """Rewrite the comparisons log with only the live comparisons (compaction)"""
     f = get_comparisons_file(mission_id)
-    with open(f, "w") as fh:
-        json.dump(comparisons, fh, indent=2)
+    tmp = f.with_suffix(".jsonl.tmp")
+    with _comparisons_lock:
+        tmp.write_bytes(b"".join(orjson.dumps(c) + b"\n" for c in comparisons))
+        os.replace(tmp, f)
+        _cache_comparisons(f, list(comparisons), 0)
+
+def append_comparison(mission_id: str, fields: dict) -> dict:
+    """Append one comparison to the log, assigning its id"""
+    with _comparisons_lock:
+        comparisons = load_comparisons(mission_id)
+        # Under the lock so concurrent saves can't pick the same id
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        taken = {c["id"] for c in comparisons}
+        n = len(comparisons)
+        while (comp_id := f"comp_{stamp}_{n}") in taken:
+            n += 1
+        comparison = {"id": comp_id, **fields}
+        f = get_comparisons_file(mission_id)
+        tombstones = _comparisons_cache[str(f)][2] if f.exists() else 0
+        with open(f, "ab") as fh:
+            fh.write(orjson.dumps(comparison) + b"\n")
+        comparisons.append(comparison)
+        _cache_comparisons(f, comparisons, tombstones)
+    return comparison
+
+def remove_comparison(mission_id: str, comparison_id: str) -> bool:
+    """Tombstone a comparison, compacting the log when it gets fragmented"""
+    with _comparisons_lock:
+        comparisons = load_comparisons(mission_id)
+        remaining = [c for c in comparisons if c["id"] != comparison_id]
+        if len(remaining) == len(comparisons):
+            return False
+        f = get_comparisons_file(mission_id)
+        tombstones = _comparisons_cache[str(f)][2] + 1
+        # Dead lines: each tombstone plus the comparison line(s) it cancels
+        dead = 2 * tombstones
+        if dead > COMPARISONS_COMPACT_RATIO * (dead + len(remaining)):
+            save_comparisons(mission_id, remaining)
+        else:
+            with open(f, "ab") as fh:
+                fh.write(orjson.dumps({"id": comparison_id, "_deleted": True}) + b"\n")
+            _cache_comparisons(f, remaining, tombstones)
+        return True
 
 @app.get("/api/missions/{mission_id}/comparisons")
 async def list_comparisons(mission_id: str):
     """List all saved comparisons for a mission"""
-    mission_dir = Path(MISSIONS_DIR) / mission_id
-    if not mission_dir.exists():
-        raise HTTPException(status_code=404, detail="Mission non trouvee")
+    require_mission_dir(mission_id)
     comparisons = load_comparisons(mission_id)
     # Return without full result data for list view
     return [
@@ -4664,10 +4977,10 @@ async def list_comparisons(mission_id: str):
             "log_b_id": c["log_b_id"],
             "log_b_name": c["log_b_name"],
             "created_at": c["created_at"],
-            "differential_count": c.get("result", {}).get("differential_count", 0),
-            "only_a_count": c.get("result", {}).get("only_a_count", 0),
-            "only_b_count": c.get("result", {}).get("only_b_count", 0),
-            "identical_count": c.get("result", {}).get("identical_count", 0),
+            "differential_count": c["differential_count"],
+            "only_a_count": c["only_a_count"],
+            "only_b_count": c["only_b_count"],
+            "identical_count": c["identical_count"],
         }
         for c in comparisons
     ]
@@ -4675,31 +4988,24 @@ async def list_comparisons(mission_id: str):
 @app.post("/api/missions/{mission_id}/comparisons")
 async def save_comparison(mission_id: str, req: SavedComparisonRequest):
     """Save a comparison result"""
-    mission_dir = Path(MISSIONS_DIR) / mission_id
-    if not mission_dir.exists():
-        raise HTTPException(status_code=404, detail="Mission non trouvee")
+    require_mission_dir(mission_id)
     
-    comparisons = load_comparisons(mission_id)
-    
-    comp_id = f"comp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(comparisons)}"
-    new_comp = {
-        "id": comp_id,
+    fields = {
         "name": req.name,
         "log_a_id": req.log_a_id,
         "log_a_name": req.log_a_name,
         "log_b_id": req.log_b_id,
         "log_b_name": req.log_b_name,
         "created_at": datetime.now().isoformat(),
+        **{key: req.result.get(key, 0) for key in COMPARISON_SUMMARY_KEYS},
         "result": req.result,
     }
-    comparisons.append(new_comp)
-    save_comparisons(mission_id, comparisons)
-    
-    return new_comp
+    return await asyncio.to_thread(append_comparison, mission_id, fields)
 
 @app.get("/api/missions/{mission_id}/comparisons/{comparison_id}")
 async def get_comparison(mission_id: str, comparison_id: str):
     """Get a single saved comparison with full result"""
+    require_mission_dir(mission_id)
     comparisons = load_comparisons(mission_id)
     for c in comparisons:
         if c["id"] == comparison_id:
@@ -4709,11 +5015,9 @@ async def get_comparison(mission_id: str, comparison_id: str):
 @app.delete("/api/missions/{mission_id}/comparisons/{comparison_id}")
 async def delete_comparison(mission_id: str, comparison_id: str):
     """Delete a saved comparison"""
-    comparisons = load_comparisons(mission_id)
-    new_comparisons = [c for c in comparisons if c["id"] != comparison_id]
-    if len(new_comparisons) == len(comparisons):
+    require_mission_dir(mission_id)
+    if not await asyncio.to_thread(remove_comparison, mission_id, comparison_id):
         raise HTTPException(status_code=404, detail="Comparaison non trouvee")
-    save_comparisons(mission_id, new_comparisons)
     return {"status": "deleted", "id": comparison_id}
 
 
@@ -4732,169 +5036,236 @@ systemctl restart aurige-web
 # Note: we don't restart aurige-api here as it would kill this script
 """
         script_path = "/tmp/restart_services.sh"
-        with open(script_path, "w") as f:
-            f.write(script)
-        os.chmod(script_path, 0o755)
         
-        # Run in background
-        subprocess.Popen(["sudo", script_path], 
-                        stdout=subprocess.DEVNULL, 
-                        stderr=subprocess.DEVNULL,
-                        start_new_session=True)
+        def launch_script():
+            with open(script_path, "w") as f:
+                f.write(script)
+            os.chmod(script_path, 0o755)
+            
+            # Run in background
+            subprocess.Popen(["sudo", script_path], 
+                            stdout=subprocess.DEVNULL, 
+                            stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+        
+        await asyncio.to_thread(launch_script)
         
         return {"success": True, "message": "Services will restart in 2 seconds"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to restart: {str(e)}")
 
+# Last check-update result, served again for UPDATE_CHECK_TTL seconds
+UPDATE_CHECK_TTL = 60.0
+_update_check_cache: Optional[tuple[float, dict]] = None
+
 @app.get("/api/system/check-update")
 async def check_update():
     """Check if there's a new version available via git"""
     import subprocess
+    global _update_check_cache
+    
+    now = time.monotonic()
+    if _update_check_cache and now - _update_check_cache[0] < UPDATE_CHECK_TTL:
+        return _update_check_cache[1]
+    
     try:
-        repo_dir = Path("/opt/aurige/repo")
+        repo_dir = Path(GIT_REPO_PATH)
         if not repo_dir.exists():
             return {"has_update": False, "message": "No git repo found"}
         
-        # Fetch latest
-        subprocess.run(["git", "fetch", "origin"], cwd=repo_dir, capture_output=True)
-        
-        # Compare with remote
-        local = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_dir, capture_output=True, text=True)
-        remote = subprocess.run(["git", "rev-parse", "origin/HEAD"], cwd=repo_dir, capture_output=True, text=True)
+        # Fetch latest (network round-trip: keep it off the event loop)
+        await asyncio.to_thread(
+            subprocess.run, ["git", "fetch", "--no-tags", "origin"], cwd=repo_dir, capture_output=True
+        )
         
-        local_hash = local.stdout.strip()
-        remote_hash = remote.stdout.strip()
+        # Compare with remote: both hashes from a single rev-parse
+        revs = await asyncio.to_thread(
+            subprocess.run, ["git", "rev-parse", "HEAD", "origin/HEAD"], cwd=repo_dir, capture_output=True, text=True
+        )
+        hashes = revs.stdout.split()
+        local_hash = hashes[0] if hashes else ""
+        remote_hash = hashes[1] if revs.returncode == 0 and len(hashes) > 1 else ""
         
-        return {
+        result = {
             "has_update": local_hash != remote_hash,
             "local_version": local_hash[:8],
             "remote_version": remote_hash[:8] if remote_hash else "unknown"
         }
+        _update_check_cache = (now, result)
+        return result
     except Exception as e:
         return {"has_update": False, "error": str(e)}
 
 
 # Mission Global Export
-@app.get("/api/missions/{mission_id}/export")
-async def export_mission(mission_id: str):
-    """Export all mission data as a ZIP archive"""
-    import zipfile
-    import io
-    import re
-    from datetime import datetime
+class ZipStreamBuffer:
+    """
+    Write-only sink for zipfile.ZipFile.
+    Having no tell()/seek(), zipfile treats it as unseekable and writes data
+    descriptors, so compressed bytes can be sent while the archive is built.
+    """
+    def __init__(self):
+        self._chunks: list[bytes] = []
     
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+DBC_HEADER = 'VERSION ""\n\nNS_ :\n\nBS_:\n\nBU_:\n\n'
+DBC_MSG_TEMPLATE = 'BO_ {} MSG_{}: 8 Vector__XXX\n'
+# name, start_bit, length, byte_order, sign, scale, offset, min, max, unit
+DBC_SIG_TEMPLATE = ' SG_ {} : {}|{}@{}{} ({},{}) [{}|{}] "{}" Vector__XXX\n'
+DBC_COMMENT_TEMPLATE = 'CM_ SG_ {} {} "{}";\n'
+
+EXPORT_COPY_BLOCK = 1 << 20
+
+
+def make_zip_info(zf: zipfile.ZipFile, arcname: str, st: os.stat_result) -> zipfile.ZipInfo:
+    """
+    Build the ZipInfo of a file from the stat of its open handle (ZipFile.write stats by path).
+    """
+    zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime(st.st_mtime)[:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    # Every entry is DEFLATE'd, logs included: candump text shrinks to ~30% at
+    # level 1, so storing it would send ~3x the bytes over the Pi's network link
+    zinfo.compress_type = zf.compression
+    # zf.open() takes the level from the ZipInfo, as ZipFile.write sets it.
+    # Public since Python 3.13; 3.11 (Raspberry Pi OS bookworm) only has the private name
+    if hasattr(zinfo, "compress_level"):
+        zinfo.compress_level = zf.compresslevel
+    else:
+        zinfo._compresslevel = zf.compresslevel
+    return zinfo
+
+
+def iter_zip_file(zf: zipfile.ZipFile, sink: ZipStreamBuffer, path: str, arcname: str):
+    """
+    Add a file to the archive in 1 MiB blocks, yielding compressed bytes as
+    they are produced: memory stays bounded whatever the file size.
+    """
     try:
-        mission_dir = MISSIONS_DIR / mission_id
-        if not mission_dir.exists():
-            raise HTTPException(status_code=404, detail="Mission not found")
-        
-        # Load mission metadata
-        metadata_file = mission_dir / "mission.json"
-        mission_name = mission_id
+        src = open(path, "rb")
+    except FileNotFoundError:
+        # Deleted since the directory scan: leave it out rather than break the archive
+        print(f"[WARNING] Export: {path} disappeared, skipped")
+        return
+    zinfo = make_zip_info(zf, arcname, os.fstat(src.fileno()))
+    # force_zip64: the sink is unseekable, sizes can't be patched afterwards
+    with src, zf.open(zinfo, "w", force_zip64=True) as dst:
+        while block := src.read(EXPORT_COPY_BLOCK):
+            dst.write(block)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def build_dbc_content(dbc_data: dict) -> str:
+    """Generate a standard DBC file from the dbc.json structure"""
+    # Generate DBC content
+    dbc_out = io.StringIO()
+    dbc_out.write(DBC_HEADER)
+
+    # Get messages with signals from the dbc.json structure
+    messages = dbc_data.get("messages", [])
+    signals_by_id = defaultdict(list)
+    for msg in messages:
+        signals_by_id[msg.get("can_id", "000")].extend(msg.get("signals", []))
+    can_id_ints = {can_id: int(can_id, 16) for can_id in signals_by_id}
+
+    # Generate BO_ (message) and SG_ (signal) entries
+    for can_id, sigs in signals_by_id.items():
+        dbc_out.write(DBC_MSG_TEMPLATE.format(can_id_ints[can_id], can_id))
+
+        for sig in sigs:
+            dbc_out.write(DBC_SIG_TEMPLATE.format(
+                sig.get("name", f"SIG_{can_id}"),
+                sig.get("start_bit", 0),
+                sig.get("length", 8),
+                1 if sig.get("byte_order") == "little_endian" else 0,
+                "-" if sig.get("is_signed") else "+",
+                sig.get("scale", 1),
+                sig.get("offset", 0),
+                sig.get("min_val", 0),
+                sig.get("max_val", 255),
+                sig.get("unit", ""),
+            ))
+
+        dbc_out.write("\n")
+
+    # Add comments
+    dbc_out.write("\n")
+    for can_id, sigs in signals_by_id.items():
+        for sig in sigs:
+            comment = sig.get("comment", "")
+            if comment:
+                name = sig.get("name", f"SIG_{can_id}")
+                dbc_out.write(DBC_COMMENT_TEMPLATE.format(can_id_ints[can_id], name, comment))
+
+    # Every line ends with a newline; the file itself does not
+    return dbc_out.getvalue()[:-1]
+
+
+def iter_mission_zip(
+    mission_dir: Path,
+    safe_name: str,
+    mission_name: str,
+    dbc_content: Optional[str],
+    comparisons: list[dict],
+):
+    """
+    Build the mission export archive, yielding compressed bytes after each entry.
+    Blocking: StreamingResponse iterates it in the threadpool, after the 200 is
+    sent, so whatever can fail is read beforehand by export_mission.
+    """
+    metadata_file = mission_dir / "mission.json"
+    sink = ZipStreamBuffer()
+    
+    # Level 1: ~3x faster DEFLATE than the default, negligible ratio loss on CAN logs
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        # Add mission metadata
         if metadata_file.exists():
-            with open(metadata_file, "r") as f:
-                meta = json.load(f)
-                mission_name = meta.get("name", mission_id)
-        
-        # Sanitize mission name for filesystem
-        safe_name = re.sub(r'[^\w\-_]', '_', mission_name)
-        
-        # Create ZIP in memory
-        buffer = io.BytesIO()
+            zf.write(metadata_file, f"{safe_name}/mission.json")
+            yield sink.drain()
+        
+        # Add all .log files (CAN captures)
+        logs_dir = mission_dir / "logs"
+        if logs_dir.exists():
+            for entry in iter_log_entries(logs_dir):
+                yield from iter_zip_file(zf, sink, entry.path, f"{safe_name}/logs/{entry.name}")
+        
+        # Add isolation logs
+        isolation_dir = mission_dir / "isolation"
+        if isolation_dir.exists():
+            for entry in iter_log_entries(isolation_dir, recursive=True):
+                rel_path = os.path.relpath(entry.path, isolation_dir)
+                yield from iter_zip_file(zf, sink, entry.path, f"{safe_name}/isolation/{rel_path}")
+        
+        # Add DBC file if exists
+        dbc_file = mission_dir / "dbc.json"
+        if dbc_file.exists():
+            zf.write(dbc_file, f"{safe_name}/dbc.json")
+        # Generated DBC file (standard format)
+        if dbc_content is not None:
+            zf.writestr(f"{safe_name}/{safe_name}.dbc", dbc_content)
+        
+        # Add saved comparisons, exported as a single JSON document
+        if comparisons:
+            zf.writestr(
+                f"{safe_name}/comparisons.json",
+                orjson.dumps(comparisons, option=orjson.OPT_INDENT_2),
+            )
         
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            # Add mission metadata
-            if metadata_file.exists():
-                zf.write(metadata_file, f"{safe_name}/mission.json")
-            
-            # Add all .log files (CAN captures)
-            logs_dir = mission_dir / "logs"
-            if logs_dir.exists():
-                for log_file in logs_dir.glob("*.log"):
-                    zf.write(log_file, f"{safe_name}/logs/{log_file.name}")
-            
-            # Add isolation logs
-            isolation_dir = mission_dir / "isolation"
-            if isolation_dir.exists():
-                for log_file in isolation_dir.rglob("*.log"):
-                    rel_path = log_file.relative_to(isolation_dir)
-                    zf.write(log_file, f"{safe_name}/isolation/{rel_path}")
-            
-            # Add DBC file if exists
-            dbc_file = mission_dir / "dbc.json"
-            if dbc_file.exists():
-                zf.write(dbc_file, f"{safe_name}/dbc.json")
-                
-                # Also generate and include the actual DBC file
-                try:
-                    with open(dbc_file, "r") as f:
-                        dbc_data = json.load(f)
-                    
-                    # Generate DBC content
-                    dbc_lines = [
-                        'VERSION ""',
-                        '',
-                        'NS_ :',
-                        '',
-                        'BS_:',
-                        '',
-                        'BU_:',
-                        '',
-                    ]
-                    
-                    # Get messages with signals from the dbc.json structure
-                    messages = dbc_data.get("messages", [])
-                    signals_by_id = {}
-                    for msg in messages:
-                        can_id = msg.get("can_id", "000")
-                        if can_id not in signals_by_id:
-                            signals_by_id[can_id] = []
-                        signals_by_id[can_id].extend(msg.get("signals", []))
-                    
-                    # Generate BO_ (message) and SG_ (signal) entries
-                    for can_id, sigs in signals_by_id.items():
-                        can_id_int = int(can_id, 16)
-                        msg_name = f"MSG_{can_id}"
-                        dbc_lines.append(f'BO_ {can_id_int} {msg_name}: 8 Vector__XXX')
-                        
-                        for sig in sigs:
-                            name = sig.get("name", f"SIG_{can_id}")
-                            start_bit = sig.get("start_bit", 0)
-                            length = sig.get("length", 8)
-                            byte_order = 1 if sig.get("byte_order") == "little_endian" else 0
-                            is_signed = "-" if sig.get("is_signed") else "+"
-                            scale = sig.get("scale", 1)
-                            offset = sig.get("offset", 0)
-                            min_val = sig.get("min_val", 0)
-                            max_val = sig.get("max_val", 255)
-                            unit = sig.get("unit", "")
-                            
-                            dbc_lines.append(f' SG_ {name} : {start_bit}|{length}@{byte_order}{is_signed} ({scale},{offset}) [{min_val}|{max_val}] "{unit}" Vector__XXX')
-                        
-                        dbc_lines.append('')
-                    
-                    # Add comments
-                    dbc_lines.append('')
-                    for can_id, sigs in signals_by_id.items():
-                        for sig in sigs:
-                            comment = sig.get("comment", "")
-                            if comment:
-                                can_id_int = int(can_id, 16)
-                                name = sig.get("name", f"SIG_{can_id}")
-                                dbc_lines.append(f'CM_ SG_ {can_id_int} {name} "{comment}";')
-                    
-                    dbc_content = "\n".join(dbc_lines)
-                    zf.writestr(f"{safe_name}/{safe_name}.dbc", dbc_content)
-                except Exception as e:
-                    print(f"[WARNING] Could not generate DBC: {e}")
-            
-            # Add comparisons file if exists
-            comp_file = mission_dir / "comparisons.json"
-            if comp_file.exists():
-                zf.write(comp_file, f"{safe_name}/comparisons.json")
-            
-            # Add a README
-            readme = f"""# Mission Export: {mission_name}
+        # Add a README
+        readme = f"""# Mission Export: {mission_name}
 Exported: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 ## Contents:
@@ -4909,16 +5280,57 @@ Exported: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 - Import .log files into any CAN analysis tool
 - Use the .dbc file with CANalyzer, SavvyCAN, or similar tools
 """
-            zf.writestr(f"{safe_name}/README.txt", readme)
+        zf.writestr(f"{safe_name}/README.txt", readme)
+    
+    # Central directory, written on close
+    yield sink.drain()
+
+
+@app.get("/api/missions/{mission_id}/export")
+async def export_mission(mission_id: str):
+    """Export all mission data as a ZIP archive"""
+    try:
+        mission_dir = require_mission_dir(mission_id)
+        
+        # Load mission metadata
+        metadata_file = mission_dir / "mission.json"
+        mission_name = mission_id
+        if metadata_file.exists():
+            meta = orjson.loads(metadata_file.read_bytes())
+            mission_name = meta.get("name", mission_id)
         
-        buffer.seek(0)
+        # Sanitize mission name for filesystem
+        safe_name = UNSAFE_NAME_CHARS_RE.sub('_', mission_name)
         
         # Generate filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{safe_name}_{timestamp}.zip"
         
-        return Response(
-            content=buffer.getvalue(),
+        # Read everything that can fail before streaming: once the 200 headers
+        # are sent, an error can no longer become a 500
+        dbc_content = None
+        dbc_file = mission_dir / "dbc.json"
+        if dbc_file.exists():
+            try:
+                dbc_content = build_dbc_content(orjson.loads(dbc_file.read_bytes()))
+            except Exception as e:
+                print(f"[WARNING] Could not generate DBC: {e}")
+        
+        comparisons = load_comparisons(mission_id)
+        
+        def stream():
+            try:
+                yield from iter_mission_zip(mission_dir, safe_name, mission_name, dbc_content, comparisons)
+            except Exception as e:
+                # The 200 is already sent: the client gets a truncated ZIP, log why
+                print(f"[ERROR] Export mission failed while streaming: {e}")
+                import traceback
+                traceback.print_exc()
+                raise
+        
+        # Stream the archive as it is compressed (generator runs in the threadpool)
+        return StreamingResponse(
+            stream(),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"'